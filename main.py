@@ -1,16 +1,130 @@
 import asyncio
+import itertools
 import logging
+import math
+import multiprocessing
+import os
 import random
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
-
-from playwright.async_api import Page
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Mapping,
+    TypedDict,
+    Union,
+)
+
+import httpx
+from playwright.async_api import (
+    Browser,
+    Cookie,
+    ElementHandle,
+    FloatRect,
+    Frame,
+    Page,
+)
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from camoufox.async_api import AsyncCamoufox
 from browserforge.fingerprints import Screen
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 logger = logging.getLogger(__name__)
 
+_solver_logger = logger.getChild("solver")
+_solver_logger.setLevel(logging.DEBUG)
+
+T = TypeVar("T")
+
+CHALLENGE_FRAME_URL = "https://challenges.cloudflare.com"
+CHALLENGE_FRAME_SELECTOR = f'iframe[src^="{CHALLENGE_FRAME_URL}"]'
+
+_MOUSE_POOL_SIZE = 4096
+_mouse_pool_rng = random.Random()
+
+# (jitter_x, jitter_y, steps, ctrl1_x, ctrl1_y, ctrl2_x, ctrl2_y, duration)
+_MOUSE_POOL: Tuple[Tuple[float, ...], ...] = tuple(
+    (
+        _mouse_pool_rng.uniform(-5, 5),
+        _mouse_pool_rng.uniform(-5, 5),
+        _mouse_pool_rng.randint(10, 25),
+        _mouse_pool_rng.gauss(0, 1),
+        _mouse_pool_rng.gauss(0, 1),
+        _mouse_pool_rng.gauss(0, 1),
+        _mouse_pool_rng.gauss(0, 1),
+        _mouse_pool_rng.uniform(0.2, 0.5),
+    )
+    for _ in range(_MOUSE_POOL_SIZE)
+)
+
+
+def _bezier_path(
+    start: Tuple[float, float],
+    end: Tuple[float, float],
+    steps: int,
+    controls: Sequence[float],
+) -> List[Tuple[float, float]]:
+    """Sample a cubic Bezier curve from start to end with sine-eased spacing."""
+
+    (x0, y0), (x3, y3) = start, end
+    spread = max(math.hypot(x3 - x0, y3 - y0) * 0.15, 5.0)
+
+    x1 = x0 + (x3 - x0) / 3 + controls[0] * spread
+    y1 = y0 + (y3 - y0) / 3 + controls[1] * spread
+    x2 = x0 + (x3 - x0) * 2 / 3 + controls[2] * spread
+    y2 = y0 + (y3 - y0) * 2 / 3 + controls[3] * spread
+
+    points = []
+
+    for step in range(1, steps + 1):
+        t = (1 - math.cos(math.pi * step / steps)) / 2
+        u = 1 - t
+        points.append(
+            (
+                u**3 * x0 + 3 * u**2 * t * x1 + 3 * u * t**2 * x2 + t**3 * x3,
+                u**3 * y0 + 3 * u**2 * t * y1 + 3 * u * t**2 * y2 + t**3 * y3,
+            )
+        )
+    return points
+
+
+def _run(coro: Coroutine[Any, Any, T]) -> T:
+    """Run coro on uvloop when it is installed, plain asyncio otherwise."""
+
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
+
+class _SolverLogger(logging.LoggerAdapter):
+    """Adapter over the shared solver logger that applies a per-solver level."""
+
+    def __init__(self, debug: bool) -> None:
+        """Initialize with DEBUG level when debug is set, INFO otherwise."""
+
+        super().__init__(_solver_logger, {})
+        self.level = logging.DEBUG if debug else logging.INFO
+
+    def isEnabledFor(self, level: int) -> bool:
+        """Check level against this solver's level and the shared logger."""
+
+        return level >= self.level and self.logger.isEnabledFor(level)
+
 
 class ChallengeType(Enum):
     """Enum for Cloudflare challenge types."""
@@ -19,15 +133,39 @@ class ChallengeType(Enum):
     TURNSTILE = "turnstile"
 
 
-@dataclass
+class PlaywrightCookie(TypedDict):
+    """Cookie dict from context.cookies() with every key required."""
+
+    name: str
+    value: str
+    domain: str
+    path: str
+    expires: float
+    httpOnly: bool
+    secure: bool
+    sameSite: str
+
+
+@dataclass(frozen=True)
 class CloudflareCookie:
     """Dataclass representing Cloudflare challenge cookie."""
 
+    __slots__ = (
+        "name",
+        "value",
+        "domain",
+        "path",
+        "expires",
+        "http_only",
+        "secure",
+        "same_site",
+    )
+
     name: str
     value: str
     domain: str
     path: str
-    expires: int
+    expires: float
     http_only: bool
     secure: bool
     same_site: str
@@ -38,10 +176,29 @@ class CloudflareCookie:
         if not self.name or not self.value:
             raise ValueError("Cookie name and value must be set")
 
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle through __init__, which frozen slotted instances need."""
+
+        return (self.__class__, tuple(getattr(self, name) for name in self.__slots__))
+
     @classmethod
-    def from_json(cls, cookie_data: Dict[str, Any]) -> "CloudflareCookie":
+    def from_json(cls, cookie_data: Mapping[str, Any]) -> "CloudflareCookie":
         """Create CloudflareCookie from dictionary."""
 
+        try:
+            return cls(
+                name=cookie_data["name"],
+                value=cookie_data["value"],
+                domain=cookie_data["domain"],
+                path=cookie_data["path"],
+                expires=cookie_data["expires"],
+                http_only=cookie_data["httpOnly"],
+                secure=cookie_data["secure"],
+                same_site=cookie_data["sameSite"],
+            )
+        except KeyError:
+            pass
+
         return cls(
             name=cookie_data.get("name", ""),
             value=cookie_data.get("value", ""),
@@ -53,11 +210,24 @@ class CloudflareCookie:
             same_site=cookie_data.get("sameSite", "Lax"),
         )
 
+    @classmethod
+    def from_playwright(cls, cookie: PlaywrightCookie) -> "CloudflareCookie":
+        """Create CloudflareCookie from a cookie returned by context.cookies().
+
+        Playwright's own Cookie type does not mark its keys as required, but
+        the cookies it returns carry all of them. Missing keys fall back to
+        the from_json() defaults.
+        """
+
+        return cls.from_json(cookie)
+
 
 @dataclass
 class TurnstileToken:
     """Dataclass representing Cloudflare Turnstile token."""
 
+    __slots__ = ("token",)
+
     token: str
 
     def __post_init__(self) -> None:
@@ -67,9 +237,19 @@ class TurnstileToken:
             raise ValueError("Token must be set")
 
 
+BatchResult = Union[CloudflareCookie, TurnstileToken, BaseException, None]
+
+
 class CloudflareSolver:
     """Solver for Cloudflare anti-bot challenges."""
 
+    _SCREEN = Screen(max_width=1920, max_height=1080)
+
+    backoff_base: float = 0.25
+    backoff_max: float = 4.0
+    cookie_timeout: float = 5.0
+    cookie_poll_interval: float = 0.1
+
     def __init__(
         self,
         challenge_type: ChallengeType = ChallengeType.CHALLENGE,
@@ -79,6 +259,9 @@ class CloudflareSolver:
         debug: bool = False,
         retries: int = 30,
         proxy: Optional[str] = None,
+        block_resources: bool = False,
+        screen: Optional[Screen] = None,
+        precheck: bool = True,
     ) -> None:
         """Initialize solver with given parameters."""
 
@@ -91,167 +274,610 @@ class CloudflareSolver:
         self.debug = debug
         self.retries = retries
         self.proxy = proxy
+        self.block_resources = block_resources
+        self.screen = screen or self._SCREEN
+        self.precheck = precheck
+        self._camoufox: Optional[AsyncCamoufox] = None
+        self._browser: Optional[Browser] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._challenge_elements: Dict[Page, ElementHandle] = {}
+        self._mouse_positions: Dict[Page, Tuple[float, float]] = {}
+        self._rng = random.Random()
+        self._mouse_pool_index = itertools.count(self._rng.randrange(_MOUSE_POOL_SIZE))
+        self._handlers: Dict[
+            ChallengeType,
+            Tuple[
+                Callable[[Page, str], Awaitable[Any]],
+                Callable[[Any], Union[CloudflareCookie, TurnstileToken]],
+            ],
+        ] = {
+            ChallengeType.CHALLENGE: (
+                self._handle_challenge_cookie,
+                self._challenge_cookie_result,
+            ),
+            ChallengeType.TURNSTILE: (
+                self._handle_turnstile_token,
+                self._turnstile_token_result,
+            ),
+        }
+        self.log = _SolverLogger(debug)
+
+    def _new_camoufox(self) -> AsyncCamoufox:
+        """Create a Camoufox launcher from the solver options."""
+
+        proxy_config = {"server": self.proxy} if self.proxy else None
+
+        return AsyncCamoufox(
+            headless=self.headless,
+            os=self.os,
+            screen=self.screen,
+            proxy=proxy_config,
+            block_images=self.block_resources,
+        )
+
+    @asynccontextmanager
+    async def _browser_for_call(
+        self, browser: Optional[Browser]
+    ) -> AsyncIterator[Browser]:
+        """Yield browser, or launch one that lives only for this call."""
 
-        if debug:
-            logging.basicConfig(level=logging.DEBUG)
+        if browser is not None:
+            yield browser
+            return
+
+        async with self._new_camoufox() as launched:
+            yield launched
+
+    async def __aenter__(self) -> "CloudflareSolver":
+        """Launch the browser once so it can be reused across solve() calls."""
+
+        if self._camoufox is not None:
+            raise RuntimeError("CloudflareSolver browser is already open")
+
+        self._camoufox = camoufox = self._new_camoufox()
+
+        try:
+            self._browser = await camoufox.__aenter__()
+        except BaseException:
+            self._camoufox = None
+            raise
+
+        self._http_client = self._new_http_client()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Close the shared browser and precheck client."""
+
+        camoufox, self._camoufox, self._browser = self._camoufox, None, None
+        http_client, self._http_client = self._http_client, None
+
+        try:
+            if http_client:
+                await http_client.aclose()
+        finally:
+            if camoufox:
+                await camoufox.__aexit__(*exc_info)
+
+    def _new_http_client(self) -> Optional[httpx.AsyncClient]:
+        """Create the precheck HTTP client, or None when the precheck is off."""
+
+        if not self.precheck:
+            return None
+
+        try:
+            return httpx.AsyncClient(follow_redirects=True, timeout=5, proxy=self.proxy)
+        except Exception as e:
+            self.log.debug("Cannot create Cloudflare precheck client: %s", e)
+            return None
+
+    @asynccontextmanager
+    async def _http_client_for_call(
+        self, http_client: Optional[httpx.AsyncClient]
+    ) -> AsyncIterator[Optional[httpx.AsyncClient]]:
+        """Yield http_client, or open a precheck client that lives for this call."""
+
+        if http_client is not None:
+            yield http_client
+            return
+
+        opened = self._new_http_client()
+
+        if opened is None:
+            yield None
+            return
+
+        async with opened:
+            yield opened
+
+    async def _is_cloudflare_protected(
+        self, link: str, http_client: Optional[httpx.AsyncClient]
+    ) -> bool:
+        """Check with a plain HEAD request whether link is served by Cloudflare."""
+
+        try:
+            async with self._http_client_for_call(http_client) as client:
+                if client is None:
+                    return True
+                response = await client.head(link)
+        except Exception as e:
+            self.log.debug("Cloudflare precheck failed, using browser: %s", e)
+            return True
+
+        return (
+            "cloudflare" in response.headers.get("server", "").lower()
+            or "cf-mitigated" in response.headers
+            or response.status_code == 403
+        )
 
     async def _human_click(self, page: Page, x: float, y: float) -> None:
-        """Move mouse to coordinates with random steps and click."""
+        """Move mouse along a curved path to coordinates and click."""
 
-        target_x = x + random.uniform(-5, 5)
-        target_y = y + random.uniform(-5, 5)
+        jitter_x, jitter_y, steps, *controls, duration = _MOUSE_POOL[
+            next(self._mouse_pool_index) % _MOUSE_POOL_SIZE
+        ]
+        start = self._mouse_positions.get(page, (0.0, 0.0))
+        target = (x + jitter_x, y + jitter_y)
 
-        await page.mouse.move(target_x, target_y, steps=random.randint(10, 25))
-        await asyncio.sleep(random.uniform(0.1, 0.3))
+        for point_x, point_y in _bezier_path(start, target, int(steps), controls):
+            await page.mouse.move(point_x, point_y)
+            await asyncio.sleep(duration / steps)
+
+        self._mouse_positions[page] = target
+        await asyncio.sleep(self._rng.uniform(0.1, 0.3))
         await page.mouse.down()
-        await asyncio.sleep(random.uniform(0.05, 0.15))
+        await asyncio.sleep(self._rng.uniform(0.05, 0.15))
         await page.mouse.up()
 
+    @staticmethod
+    def _is_challenge_frame(frame: Frame) -> bool:
+        """Check whether frame hosts the Cloudflare challenge."""
+
+        return frame.url.startswith(CHALLENGE_FRAME_URL)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Jittered exponential delay before the next click attempt."""
+
+        delay = min(self.backoff_max, self.backoff_base * 2**attempt)
+        return delay * self._rng.uniform(0.5, 1.5)
+
+    async def _wait_for_challenge_frame(self, page: Page) -> bool:
+        """Wait until the Cloudflare challenge frame is attached to page."""
+
+        if any(self._is_challenge_frame(frame) for frame in page.frames):
+            return True
+
+        try:
+            await page.wait_for_event(
+                "framenavigated",
+                predicate=self._is_challenge_frame,
+                timeout=self.retries * 1000,
+            )
+            return True
+        except PlaywrightTimeoutError:
+            self.log.debug("Cloudflare challenge frame not found")
+            return False
+
+    async def _locate_challenge_frame(self, page: Page) -> Optional[FloatRect]:
+        """Return bounding box of the challenge frame, keeping its element per page."""
+
+        frame_element = self._challenge_elements.get(page)
+
+        if frame_element is None:
+            frame_element = await page.query_selector(CHALLENGE_FRAME_SELECTOR)
+
+            if frame_element is None:
+                # The selector cannot see iframes inside closed shadow roots.
+                frame = next(filter(self._is_challenge_frame, page.frames), None)
+                frame_element = await frame.frame_element() if frame else None
+
+            if frame_element is None:
+                return None
+
+            self._challenge_elements[page] = frame_element
+
+        return await frame_element.bounding_box()
+
     async def _find_and_click_challenge_frame(self, page: Page) -> bool:
         """Find Cloudflare challenge frame and click the checkbox."""
 
-        for frame in page.frames:
-            if frame.url.startswith("https://challenges.cloudflare.com"):
-                frame_element = await frame.frame_element()
-                bounding_box = await frame_element.bounding_box()
+        bounding_box = await self._locate_challenge_frame(page)
 
-                if not bounding_box:
-                    continue
+        if not bounding_box:
+            return False
 
-                checkbox_x = bounding_box["x"] + bounding_box["width"] / 9
-                checkbox_y = bounding_box["y"] + bounding_box["height"] / 2
+        checkbox_x = bounding_box["x"] + bounding_box["width"] / 9
+        checkbox_y = bounding_box["y"] + bounding_box["height"] / 2
 
-                await asyncio.sleep(self.sleep_time)
-                await self._human_click(page, checkbox_x, checkbox_y)
+        await asyncio.sleep(self.sleep_time)
+        await self._human_click(page, checkbox_x, checkbox_y)
 
-                return True
-        return False
+        return True
 
     async def _get_turnstile_token(self, page: Page) -> Optional[str]:
         """Extract Turnstile token from hidden input field."""
 
         try:
-            for _ in range(self.retries):
-                token_inputs = await page.query_selector_all(
-                    'input[name="cf-turnstile-response"]'
-                )
+            token_handle = await page.wait_for_function(
+                """() => {
+                    const selector = 'input[name="cf-turnstile-response"]';
+
+                    for (const input of document.querySelectorAll(selector)) {
+                        if (input.value && input.value.length > 10) {
+                            return input.value;
+                        }
+                    }
+                    return null;
+                }""",
+                timeout=self.retries * 1000,
+                polling=250,
+            )
+            self.log.debug("Turnstile token found")
+            return await token_handle.json_value()
+        except PlaywrightTimeoutError:
+            self.log.debug("Turnstile token not found")
+            return None
+        except Exception as e:
+            self.log.error("Error extracting Turnstile token: %s", e)
+            return None
 
-                for token_input in token_inputs:
-                    token = await token_input.get_attribute("value")
+    def _resolve_challenge_type(
+        self, challenge_type: Optional[ChallengeType]
+    ) -> ChallengeType:
+        """Default challenge_type to the solver's and check it has a handler."""
 
-                    if token and len(token) > 10:
-                        logger.debug("Turnstile token found")
-                        return token
+        challenge_type = challenge_type or self.challenge_type
 
-                await asyncio.sleep(1)
+        if challenge_type not in self._handlers:
+            raise ValueError(f"No handler registered for {challenge_type}")
+        return challenge_type
 
-            logger.debug("Turnstile token not found")
-            return None
-        except Exception as e:
-            logger.error(f"Error extracting Turnstile token: {e}")
-            return None
+    def _challenge_cookie_result(self, cookie: Cookie) -> CloudflareCookie:
+        """Wrap a cf_clearance cookie and remember it on the solver."""
+
+        self.cf_clearance = CloudflareCookie.from_json(cookie)
+        return self.cf_clearance
+
+    def _turnstile_token_result(self, token: str) -> TurnstileToken:
+        """Wrap a Turnstile token and remember it on the solver."""
+
+        self.turnstile_token = TurnstileToken(token=token)
+        return self.turnstile_token
 
     async def solve(
-        self, link: str
+        self, link: str, challenge_type: Optional[ChallengeType] = None
     ) -> Optional[Union[CloudflareCookie, TurnstileToken]]:
         """Solve Cloudflare challenge and return result based on challenge type."""
 
-        proxy_config = {"server": self.proxy} if self.proxy else None
+        return await self._solve_or_none(
+            self._browser,
+            self._http_client,
+            link,
+            self._resolve_challenge_type(challenge_type),
+        )
+
+    async def solve_raw(
+        self, link: str, challenge_type: Optional[ChallengeType] = None
+    ) -> Optional[Union[Cookie, str]]:
+        """Solve Cloudflare challenge and return the raw Playwright cookie or token."""
+
+        challenge_type = self._resolve_challenge_type(challenge_type)
 
         try:
-            async with AsyncCamoufox(
-                headless=self.headless,
-                os=self.os,
-                screen=Screen(max_width=1920, max_height=1080),
-                proxy=proxy_config,
-            ) as browser:
-                page = await browser.new_page()
-                await page.goto(link)
-
-                for _ in range(self.retries):
-                    if await self._find_and_click_challenge_frame(page):
-                        await asyncio.sleep(1)
-                        break
-                    await asyncio.sleep(1)
-
-                if self.challenge_type == ChallengeType.CHALLENGE:
-                    cookies = await page.context.cookies()
-
-                    cf_clearance_cookie = next(
-                        (
-                            cookie
-                            for cookie in cookies
-                            if cookie.get("name") == "cf_clearance"
-                        ),
-                        None,
+            return await self._solve_raw(
+                self._browser, self._http_client, link, challenge_type
+            )
+        except Exception as e:
+            self.log.error("Error solving Cloudflare challenge: %s", e)
+            return None
+
+    async def solve_many(
+        self, links: List[str], challenge_type: Optional[ChallengeType] = None
+    ) -> List[Optional[Union[CloudflareCookie, TurnstileToken]]]:
+        """Solve several links concurrently, each in its own browser context."""
+
+        challenge_type = self._resolve_challenge_type(challenge_type)
+
+        async with self._browser_for_call(
+            self._browser
+        ) as browser, self._http_client_for_call(self._http_client) as http_client:
+            return list(
+                await asyncio.gather(
+                    *(
+                        self._solve_or_none(browser, http_client, link, challenge_type)
+                        for link in links
                     )
+                )
+            )
 
-                    if cf_clearance_cookie:
-                        logger.debug(
-                            "cf_clearance cookie found: %s", cf_clearance_cookie
-                        )
-                        cookie_dict: Dict[str, Any] = dict(cf_clearance_cookie)
-                        self.cf_clearance = CloudflareCookie.from_json(cookie_dict)
-                    else:
-                        logger.debug("cf_clearance cookie not found")
+    async def solve_batch(
+        self,
+        links: List[str],
+        concurrency: int = 8,
+        challenge_type: Optional[ChallengeType] = None,
+    ) -> List[BatchResult]:
+        """Solve links on the shared browser with at most `concurrency` open contexts."""
+
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        challenge_type = self._resolve_challenge_type(challenge_type)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async with self._browser_for_call(
+            self._browser
+        ) as browser, self._http_client_for_call(self._http_client) as http_client:
+
+            async def solve_one(
+                link: str,
+            ) -> Optional[Union[CloudflareCookie, TurnstileToken]]:
+                async with semaphore:
+                    return await self._solve(browser, http_client, link, challenge_type)
+
+            return list(
+                await asyncio.gather(
+                    *(solve_one(link) for link in links), return_exceptions=True
+                )
+            )
 
-                        if self.debug:
-                            await page.screenshot(path="debug_failed_challenge.png")
+    async def _solve_or_none(
+        self,
+        browser: Optional[Browser],
+        http_client: Optional[httpx.AsyncClient],
+        link: str,
+        challenge_type: ChallengeType,
+    ) -> Optional[Union[CloudflareCookie, TurnstileToken]]:
+        """Run _solve(), logging any error and returning None instead."""
 
-                    return self.cf_clearance
+        try:
+            return await self._solve(browser, http_client, link, challenge_type)
+        except Exception as e:
+            self.log.error("Error solving Cloudflare challenge: %s", e)
+            return None
 
-                elif self.challenge_type == ChallengeType.TURNSTILE:
-                    token = await self._get_turnstile_token(page)
+    async def _solve(
+        self,
+        browser: Optional[Browser],
+        http_client: Optional[httpx.AsyncClient],
+        link: str,
+        challenge_type: ChallengeType,
+    ) -> Optional[Union[CloudflareCookie, TurnstileToken]]:
+        """Solve link on browser and wrap the result in its dataclass."""
 
-                    if token:
-                        self.turnstile_token = TurnstileToken(token=token)
-                    else:
-                        logger.debug("Turnstile token not found")
-                        if self.debug:
-                            await page.screenshot(path="debug_failed_turnstile.png")
+        result = await self._solve_raw(browser, http_client, link, challenge_type)
 
-                    return self.turnstile_token
+        if result is None:
+            return None
+        return self._handlers[challenge_type][1](result)
 
-        except Exception as e:
-            logger.error(f"Error solving Cloudflare challenge: {e}")
+    async def _solve_raw(
+        self,
+        browser: Optional[Browser],
+        http_client: Optional[httpx.AsyncClient],
+        link: str,
+        challenge_type: ChallengeType,
+    ) -> Optional[Union[Cookie, str]]:
+        """Precheck link, then solve it on browser or on one launched for the call."""
+
+        if (
+            self.precheck
+            and challenge_type == ChallengeType.CHALLENGE
+            and not await self._is_cloudflare_protected(link, http_client)
+        ):
+            self.log.debug("No Cloudflare protection detected for %s", link)
             return None
 
+        async with self._browser_for_call(browser) as browser:
+            return await self._solve_in_context(browser, link, challenge_type)
 
-if __name__ == "__main__":
-    print("Turnstile Example")
-    solver = CloudflareSolver(
-        challenge_type=ChallengeType.TURNSTILE,
-        proxy="http://127.0.0.1:10808",
-        debug=True,
-        headless=False,
-    )
-    result = asyncio.run(solver.solve("https://nopecha.com/captcha/turnstile"))
-
-    if result:
-        if isinstance(result, CloudflareCookie):
-            print(f"Cookie: {result.name} = {result.value}")
-        elif isinstance(result, TurnstileToken):
-            print(f"Token: {result.token}")
-    else:
-        print("Failed to solve challenge")
-
-    print("\nChallenge Example")
-    solver_challenge = CloudflareSolver(
-        challenge_type=ChallengeType.CHALLENGE,
-        proxy="http://127.0.0.1:10808",
-        debug=True,
-        headless=False,
-    )
-    result_challenge = asyncio.run(
-        solver_challenge.solve("https://nopecha.com/demo/cloudflare")
-    )
+    async def _solve_in_context(
+        self, browser: Browser, link: str, challenge_type: ChallengeType
+    ) -> Optional[Union[Cookie, str]]:
+        """Solve link in a fresh context of browser."""
+
+        context = await browser.new_context()
+        page: Optional[Page] = None
+
+        try:
+            page = await context.new_page()
+            return await self._solve_page(page, link, challenge_type)
+        finally:
+            if page:
+                self._challenge_elements.pop(page, None)
+                self._mouse_positions.pop(page, None)
+            await context.close()
+
+    async def _click_challenge(self, page: Page) -> bool:
+        """Wait for the challenge frame and click it within retries seconds."""
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.retries
+
+        if await self._wait_for_challenge_frame(page):
+            for attempt in range(self.retries):
+                if await self._find_and_click_challenge_frame(page):
+                    return True
+
+                remaining = deadline - loop.time()
+
+                if remaining <= 0:
+                    break
+
+                await asyncio.sleep(min(self._backoff_delay(attempt), remaining))
+        return False
+
+    async def _wait_for_cookie(
+        self, page: Page, link: str, name: str, timeout: float
+    ) -> Optional[Cookie]:
+        """Poll the cookies for the page and link until name is set or timeout passes."""
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        while True:
+            # page.url is the post-redirect URL, where a Secure cookie is visible.
+            cookies = await page.context.cookies([page.url, link])
+            cookie = {item["name"]: item for item in cookies}.get(name)
 
-    if result_challenge:
-        if isinstance(result_challenge, CloudflareCookie):
-            print(f"Cookie: {result_challenge.name} = {result_challenge.value}")
-            print(f"Domain: {result_challenge.domain}")
-            print(f"Expires: {result_challenge.expires}")
-        elif isinstance(result_challenge, TurnstileToken):
-            print(f"Token: {result_challenge.token}")
-    else:
-        print("Failed to solve challenge")
+            if cookie or loop.time() >= deadline:
+                return cookie
+
+            await asyncio.sleep(self.cookie_poll_interval)
+
+    async def _handle_challenge_cookie(self, page: Page, link: str) -> Optional[Cookie]:
+        """Solve a Challenge page and return its cf_clearance cookie."""
+
+        clicked = await self._click_challenge(page)
+        cf_clearance_cookie = await self._wait_for_cookie(
+            page, link, "cf_clearance", self.cookie_timeout if clicked else 0
+        )
+
+        if cf_clearance_cookie:
+            self.log.debug("cf_clearance cookie found: %s", cf_clearance_cookie)
+            return cf_clearance_cookie
+
+        self.log.debug("cf_clearance cookie not found")
+
+        if self.log.isEnabledFor(logging.DEBUG):
+            await page.screenshot(path="debug_failed_challenge.png")
+
+        return None
+
+    async def _handle_turnstile_token(self, page: Page, link: str) -> Optional[str]:
+        """Solve a Turnstile widget and return its response token."""
+
+        await self._click_challenge(page)
+
+        token = await self._get_turnstile_token(page)
+
+        if token:
+            return token
+
+        self.log.debug("Turnstile token not found")
+
+        if self.log.isEnabledFor(logging.DEBUG):
+            await page.screenshot(path="debug_failed_turnstile.png")
+
+        return None
+
+    async def _solve_page(
+        self, page: Page, link: str, challenge_type: ChallengeType
+    ) -> Optional[Union[Cookie, str]]:
+        """Navigate page to link and extract the challenge result."""
+
+        def forget_challenge_element(_: Frame) -> None:
+            self._challenge_elements.pop(page, None)
+
+        page.on("framedetached", forget_challenge_element)
+        await page.goto(link, wait_until="domcontentloaded")
+
+        return await self._handlers[challenge_type][0](page, link)
+
+
+def _solve_in_process(
+    solver_options: Dict[str, Any],
+    concurrency: int,
+    challenge_type: Optional[ChallengeType],
+    links: List[str],
+) -> List[BatchResult]:
+    """Worker entrypoint: solve links with one browser in this process."""
+
+    async def run() -> List[BatchResult]:
+        async with CloudflareSolver(**solver_options) as solver:
+            return await solver.solve_batch(links, concurrency, challenge_type)
+
+    return _run(run())
+
+
+class MultiProcessSolver:
+    """Spread solve batches over several processes, one browser each."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        concurrency: int = 8,
+        **solver_options: Any,
+    ) -> None:
+        """Initialize with worker count, per-worker concurrency and solver options."""
+
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.concurrency = concurrency
+        self.solver_options = solver_options
+
+    async def solve_batch(
+        self, links: List[str], challenge_type: Optional[ChallengeType] = None
+    ) -> List[BatchResult]:
+        """Split links round-robin across workers and return results in order."""
+
+        workers = min(self.workers, len(links))
+
+        if not workers:
+            return []
+
+        results: List[BatchResult] = [None] * len(links)
+        loop = asyncio.get_running_loop()
+
+        executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+        try:
+            chunk_results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        executor,
+                        _solve_in_process,
+                        self.solver_options,
+                        self.concurrency,
+                        challenge_type,
+                        links[worker::workers],
+                    )
+                    for worker in range(workers)
+                )
+            )
+        finally:
+            # Waiting here would block the event loop until every worker exits.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for worker, chunk in enumerate(chunk_results):
+            results[worker::workers] = chunk
+
+        return results
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    async def main() -> None:
+        async with CloudflareSolver(
+            proxy="http://127.0.0.1:10808",
+            debug=True,
+            headless=False,
+        ) as solver:
+            print("Turnstile Example")
+            token = await solver.solve(
+                "https://nopecha.com/captcha/turnstile",
+                challenge_type=ChallengeType.TURNSTILE,
+            )
+
+            if token:
+                print(f"Token: {token.token}")
+            else:
+                print("Failed to solve challenge")
+
+            print("\nChallenge Example")
+            cookie = await solver.solve(
+                "https://nopecha.com/demo/cloudflare",
+                challenge_type=ChallengeType.CHALLENGE,
+            )
+
+            if cookie:
+                print(f"Cookie: {cookie.name} = {cookie.value}")
+                print(f"Domain: {cookie.domain}")
+                print(f"Expires: {cookie.expires}")
+            else:
+                print("Failed to solve challenge")
+
+    _run(main())